@@ -1,4 +1,6 @@
 import argparse
+import mmap
+import numpy as np
 from pathlib import Path
 
 def dataset_args(parser: argparse.ArgumentParser):
@@ -24,23 +26,37 @@ def find_fastas_to_process(
     output_path
 ):
     path = synthetic_data_path / "test" / distribution / dataset / synthetic_classifier
-    for fasta in path.iterdir():
-        if (output_path / fasta.with_suffix(".tax.tsv").name).exists():
-            continue
-        yield fasta
+    # Single pass over each directory using plain string ops; no per-file Path
+    # allocations or stat calls.
+    existing = {f.name for f in output_path.iterdir() if f.name.endswith(".tax.tsv")}
+    return [
+        fasta for fasta in path.iterdir()
+        if fasta.name.endswith(".fasta")
+        and fasta.name[:-len(".fasta")] + ".tax.tsv" not in existing]
 
 
 def read_fasta(path: Path):
-    with open(path) as f:
-        header = f.readline()
-        while header != "":
-            identifier = header[1:].split(maxsplit=1)[0]
-            sequence = f.readline().strip()
-            header = f.readline()
+    if path.stat().st_size == 0:
+        return
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        # Locate all line boundaries in a single numpy pass over the buffer; records are
+        # alternating header/sequence line pairs.
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        size = len(buffer)
+        line_ends = np.flatnonzero(buffer == ord('\n'))
+        del buffer # release the exported mmap pointer so the mapping can close
+        if len(line_ends) == 0 or line_ends[-1] != size - 1:
+            line_ends = np.append(line_ends, size)
+        line_starts = np.empty_like(line_ends)
+        line_starts[0] = 0
+        line_starts[1:] = line_ends[:-1] + 1
+        for i in range(0, len(line_ends) - 1, 2):
+            header = data[line_starts[i]:line_ends[i]]
+            identifier = header[1:].split(maxsplit=1)[0].decode()
+            sequence = data[line_starts[i+1]:line_ends[i+1]].decode().strip()
             yield identifier, sequence
 
 
 def write_tax_tsv(path: Path, entries):
     with open(path, 'w') as f:
-        for identifier, label in entries:
-            f.write(f"{identifier}\t{label}\n")
+        f.write("".join(f"{identifier}\t{label}\n" for identifier, label in entries))
@@ -18,7 +18,9 @@ class PersistentSetBertSfdModel(dcs.module.Wandb.PersistentObject[SetBertSfdClas
         setbert_pretrain_path = wandb.artifact_argument_path("setbert_pretrain")
         setbert_base = load_model(setbert_pretrain_path, SetBertPretrainModel).base
         model = SetBertSfdClassifierModel(setbert_base, config.freeze_sequence_embeddings)
-        model.compile(optimizer=tf.keras.optimizers.Adam(config.lr))
+        model.compile(
+            optimizer=tf.keras.optimizers.Adam(config.lr),
+            jit_compile=(not config.no_jit_compile))
         return model
 
     def load(self):
@@ -44,6 +46,8 @@ def define_arguments(context: dcs.Context):
     group.add_argument("--freeze-sequence-embeddings", default=False, action="store_true", help="Freeze the sequence embeddings.")
     group.add_argument("--chunk-size", type=int, default=None, help="The chunk size to use for the sequence embeddings. (Only used if --freeze-sequence-embeddings is set.)")
     group.add_argument("--lr", type=float, default=1e-4, help="The learning rate to use for training.")
+    group.add_argument("--no-jit-compile", default=False, action="store_true", help="Disable XLA JIT compilation of the train/test functions.")
+    group.add_argument("--mixed-precision", type=str, default="mixed_bfloat16", choices=["float32", "mixed_float16", "mixed_bfloat16"], help="The mixed-precision policy to use for the model.")
 
     wandb = context.get(dcs.module.Wandb)
     wandb.add_artifact_argument("setbert-pretrain", required=True)
@@ -61,13 +65,13 @@ def data_generators(context: dcs.Context, sequence_length: int, kmer: int):
         config.sfd_dataset_path / f"{config.sfd_dataset_path.name}.fasta.mapping.db",
         config.sfd_dataset_path / f"{config.sfd_dataset_path.name}.fasta.index.db"
     ) if s.name in targets]
-    # Remove any missing samples without targets
-    to_keep = set(s.name for s in samples) & set(targets.keys())
-    samples = [s for s in samples if s.name in to_keep]
+    # Re-key the targets in sample order (membership is already guaranteed by the filter above)
     targets = {s.name: targets[s.name] for s in samples}
     num_positive = sum(targets.values())
     num_negative = len(targets) - num_positive
     class_weights = np.array([0.5 / num_positive if targets[s.name] else 0.5 / num_negative for s in samples])
+    # Index the targets by sample position so batches can gather them without per-sample lookups
+    target_values = np.fromiter((targets[s.name] for s in samples), dtype=np.int8)
     print(f"Found {len(samples)} samples.")
     print(f"Positive: {num_positive}, Negative: {num_negative}")
 
@@ -84,7 +88,7 @@ def data_generators(context: dcs.Context, sequence_length: int, kmer: int):
         dg.augment_ambiguous_bases,
         dg.encode_sequences(),
         dg.encode_kmers(kmer),
-        lambda samples: dict(targets=np.array([targets[s.name] for s in samples])),
+        lambda sample_indices: dict(targets=target_values[sample_indices]),
         lambda encoded_kmer_sequences, targets: (encoded_kmer_sequences, targets)
     ]
 
@@ -99,12 +103,17 @@ def data_generators(context: dcs.Context, sequence_length: int, kmer: int):
         config.val_steps_per_epoch,
         generator_pipeline,
         shuffle=False)
-    return train_data, val_data
+    # Wrap in tf.data so batch generation overlaps with training on the GPU
+    return train_data.as_dataset(), val_data.as_dataset()
 
 
 def main(context: dcs.Context):
     config = context.config
 
+    # Keep master weights in fp32 and run the encoder matmuls in half precision;
+    # the sigmoid output head stays fp32 via its own dtype policy.
+    tf.keras.mixed_precision.set_global_policy(config.mixed_precision)
+
     # with context.get(dcs.module.Tensorflow).strategy().scope():
 
     # Get the model instance
@@ -4,12 +4,14 @@ Prepare a local dataset given FASTA/FASTQ files. This script can automatically c
 training/testing splits of the given FASTA/FASTQ files, outputting the desired FASTA/FASTQ or
 DB files.
 """
+from concurrent.futures import ProcessPoolExecutor
 from dnadb import dna, fasta, fastq
 from dnadb.utils import compress
-from itertools import chain
+from itertools import chain, repeat
+from numba import njit
 import numpy as np
+import os
 from pathlib import Path
-import re
 import sys
 import tf_utilities.scripting as tfs
 from tqdm.auto import tqdm, trange
@@ -17,6 +19,30 @@ from typing import Iterable, TypeVar
 
 import bootstrap
 
+# 256-byte allow-mask marking the valid DNA bases.
+ALLOWED_BASES = np.zeros(256, dtype=np.uint8)
+ALLOWED_BASES[np.frombuffer(dna.ALL_BASES.encode(), np.uint8)] = 1
+
+@njit(cache=True)
+def _filter_bytes(buffer, allow, out):
+    k = 0
+    for i in range(len(buffer)):
+        if allow[buffer[i]]:
+            out[k] = buffer[i]
+            k += 1
+    return k
+
+def clean_sequence(sequence: str) -> str:
+    """
+    Remove any characters from the sequence that are not valid DNA bases.
+    """
+    buffer = np.frombuffer(sequence.encode(), dtype=np.uint8)
+    out = np.empty(len(buffer), dtype=np.uint8)
+    k = _filter_bytes(buffer, ALLOWED_BASES, out)
+    if k == len(buffer):
+        return sequence
+    return out[:k].tobytes().decode()
+
 def define_arguments(cli: tfs.CliArgumentFactory):
     cli.use_rng()
     cli.argument("output_path", help="The path where the files will be written")
@@ -37,6 +63,7 @@ def output_fasta_file(
     config,
     filename: str,
     entries: list[fasta.FastaEntry],
+    order: np.ndarray,
     split_index: int,
     output_path: Path,
 ):
@@ -46,10 +73,10 @@ def output_fasta_file(
         test_path = output_path / "test"
         train_path = output_path / "train"
         with open(test_path / filename, 'w') as f:
-            fasta.write(f, tqdm(entries[:split_index], leave=False, desc=f"Writing {filename}"))
+            fasta.write(f, (entries[i] for i in order[:split_index]))
             files.append(Path(f.name))
     with open(train_path / filename, 'w') as f:
-        fasta.write(f, tqdm(entries[split_index:], leave=False, desc=f"Writing {filename}"))
+        fasta.write(f, (entries[i] for i in order[split_index:]))
         files.append(Path(f.name))
     return files
 
@@ -58,6 +85,7 @@ def output_fastq_file(
     config,
     filename: str,
     entries: list[fastq.FastqEntry],
+    order: np.ndarray,
     split_index: int,
     output_path: Path,
 ):
@@ -67,10 +95,10 @@ def output_fastq_file(
         test_path = output_path / "test"
         train_path = output_path / "train"
         with open(test_path / filename, 'w') as f:
-            fastq.write(f, tqdm(entries[:split_index], leave=False, desc=f"Writing {filename}"))
+            fastq.write(f, (entries[i] for i in order[:split_index]))
             files.append(Path(f.name))
     with open(train_path / filename, 'w') as f:
-        fastq.write(f, tqdm(entries[split_index:], leave=False, desc=f"Writing {filename}"))
+        fastq.write(f, (entries[i] for i in order[split_index:]))
         files.append(Path(f.name))
     return files
 
@@ -79,6 +107,7 @@ def output_fasta_db(
     config,
     filename: str,
     entries: list[fasta.FastaEntry],
+    order: np.ndarray,
     split_index: int,
     output_path: Path,
 ):
@@ -87,15 +116,16 @@ def output_fasta_db(
         test_path = output_path / "test"
         train_path = output_path / "train"
         db = fasta.FastaDbFactory(test_path / filename)
-        db.write_entries(tqdm(entries[:split_index], leave=False, desc=f"Writing {db.path.name}"))
+        db.write_entries(entries[i] for i in order[:split_index])
     db = fasta.FastaDbFactory(train_path / filename)
-    db.write_entries(tqdm(entries[split_index:], leave=False, desc=f"Writing {db.path.name}"))
+    db.write_entries(entries[i] for i in order[split_index:])
 
 
 def output_fastq_db(
     config,
     filename: str,
     entries: list[fastq.FastqEntry],
+    order: np.ndarray,
     split_index: int,
     output_path: Path,
 ):
@@ -104,9 +134,9 @@ def output_fastq_db(
         test_path = output_path / "test"
         train_path = output_path / "train"
         db = fastq.FastqDbFactory(test_path / filename)
-        db.write_entries(tqdm(entries[:split_index], leave=False, desc=f"Writing {db.path.name}"))
+        db.write_entries(entries[i] for i in order[:split_index])
     db = fastq.FastqDbFactory(train_path / filename)
-    db.write_entries(tqdm(entries[split_index:], leave=False, desc=f"Writing {db.path.name}"))
+    db.write_entries(entries[i] for i in order[split_index:])
 
 
 T = TypeVar("T", bound=fasta.FastaEntry|fastq.FastqEntry)
@@ -117,7 +147,7 @@ def read_entries(filename: str, entries: Iterable[T], min_length: int, clean_seq
     desc = f"Reading {'+ Cleaning ' if clean_sequences else ''}{filename}"
     for total_entries, entry in tqdm(enumerate(entries, start=1), desc=desc):
         if clean_sequences:
-            entry.sequence = re.sub(f"[^{dna.ALL_BASES}]", '', entry.sequence)
+            entry.sequence = clean_sequence(entry.sequence)
         if len(entry.sequence) < min_length:
             dropped_entries += 1
             continue
@@ -125,63 +155,109 @@ def read_entries(filename: str, entries: Iterable[T], min_length: int, clean_seq
     return result, dropped_entries, total_entries
 
 
-def process_fasta_files(
+def process_fasta_file(
     config,
-    fasta_files: list[Path],
+    fasta_file: Path,
     output_path: Path,
-    rng: np.random.Generator
+    seed: np.random.SeedSequence
+):
+    rng = np.random.Generator(np.random.PCG64(seed))
+    files: list[Path] = []
+    entries, num_dropped, num_sequences = read_entries(
+        fasta_file.name,
+        fasta.entries(fasta_file),
+        config.min_sequence_length,
+        config.clean_sequences)
+    split_index = int(len(entries) * config.test_split)
+    filename = fasta_file.name.rstrip('.gz')
+    # Shuffle an index permutation rather than the entry list itself to avoid
+    # moving/copying the underlying Python objects on each split.
+    order = np.arange(len(entries))
+    for i in trange(config.num_splits, desc="Split", leave=False):
+        rng.shuffle(order)
+        path = (output_path / str(i)) if config.test_split > 0.0 else output_path
+        if config.output_fasta_fastq:
+            files += output_fasta_file(config, filename, entries, order, split_index, path)
+        if config.output_db:
+            output_fasta_db(config, filename, entries, order, split_index, path)
+    return files, num_dropped, num_sequences
+
+
+def process_fastq_file(
+    config,
+    fastq_file: Path,
+    output_path: Path,
+    seed: np.random.SeedSequence
+):
+    rng = np.random.Generator(np.random.PCG64(seed))
+    files: list[Path] = []
+    entries, num_dropped, num_sequences = read_entries(
+        fastq_file.name,
+        fastq.entries(fastq_file),
+        config.min_sequence_length,
+        clean_sequences=False)
+    split_index = int(len(entries) * config.test_split)
+    filename = fastq_file.name.rstrip('.gz')
+    order = np.arange(len(entries))
+    for i in trange(config.num_splits, desc="Split", leave=False):
+        rng.shuffle(order)
+        path = (output_path / str(i)) if config.test_split > 0.0 else output_path
+        if config.output_fasta_fastq:
+            files += output_fastq_file(config, filename, entries, order, split_index, path)
+        if config.output_db:
+            output_fastq_db(config, filename, entries, order, split_index, path)
+    return files, num_dropped, num_sequences
+
+
+def process_files(
+    process_file,
+    config,
+    data_files: list[Path],
+    output_path: Path,
+    rng: np.random.Generator,
+    desc: str
 ):
+    # Each file is independent, so process them in parallel with per-file RNG seeds.
+    seeds = np.random.SeedSequence(rng.bit_generator.random_raw(2)).spawn(len(data_files))
+    if len(data_files) > 1:
+        max_workers = min(len(data_files), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(tqdm(
+                executor.map(process_file, repeat(config), data_files, repeat(output_path), seeds),
+                total=len(data_files),
+                desc=desc))
+    else:
+        results = [
+            process_file(config, file, output_path, seed)
+            for file, seed in tqdm(list(zip(data_files, seeds)), desc=desc)]
     files: list[Path] = []
     dropped_sequences: list[int] = []
     total_sequences: list[int] = []
-    for fasta_file in tqdm(fasta_files, desc="Procesing FASTA"):
-        entries, num_dropped, num_sequences = read_entries(
-            fasta_file.name,
-            fasta.entries(fasta_file),
-            config.min_sequence_length,
-            config.clean_sequences)
+    for written_files, num_dropped, num_sequences in results:
+        files += written_files
         dropped_sequences.append(num_dropped)
         total_sequences.append(num_sequences)
-        split_index = int(len(entries) * config.test_split)
-        filename = fasta_file.name.rstrip('.gz')
-        for i in trange(config.num_splits, desc="Split"):
-            rng.shuffle(entries) # type: ignore
-            path = (output_path / str(i)) if config.test_split > 0.0 else output_path
-            if config.output_fasta_fastq:
-                files += output_fasta_file(config, filename, entries, split_index, path)
-            if config.output_db:
-                output_fasta_db(config, filename, entries, split_index, path)
     return files, dropped_sequences, total_sequences
 
 
+def process_fasta_files(
+    config,
+    fasta_files: list[Path],
+    output_path: Path,
+    rng: np.random.Generator
+):
+    return process_files(
+        process_fasta_file, config, fasta_files, output_path, rng, desc="Procesing FASTA")
+
+
 def process_fastq_files(
     config,
     fastq_files: list[Path],
     output_path: Path,
     rng: np.random.Generator
 ):
-    files: list[Path] = []
-    dropped_sequences: list[int] = []
-    total_sequences: list[int] = []
-    for fastq_file in tqdm(fastq_files, desc="Procesing FASTQ"):
-        entries, num_dropped, num_sequences = read_entries(
-            fastq_file.name,
-            fastq.entries(fastq_file),
-            config.min_sequence_length,
-            clean_sequences=False)
-        dropped_sequences.append(num_dropped)
-        total_sequences.append(num_sequences)
-        entries = list(tqdm(fastq.entries(fastq_file), desc=f"Reading {fastq_file.name}"))
-        split_index = int(len(entries) * config.test_split)
-        filename = fastq_file.name.rstrip('.gz')
-        for i in trange(config.num_splits, desc="Split"):
-            rng.shuffle(entries) # type: ignore
-            path = (output_path / str(i)) if config.test_split > 0.0 else output_path
-            if config.output_fasta_fastq:
-                files += output_fastq_file(config, filename, entries, split_index, path)
-            if config.output_db:
-                output_fastq_db(config, filename, entries, split_index, path)
-    return files, dropped_sequences, total_sequences
+    return process_files(
+        process_fastq_file, config, fastq_files, output_path, rng, desc="Procesing FASTQ")
 
 
 def main():
@@ -77,6 +77,37 @@ class BatchGenerator(tf.keras.utils.Sequence, Generic[IOType]):
     def __len__(self):
         return self.batches_per_epoch
 
+    def as_dataset(self, num_parallel_calls: Optional[int] = None) -> tf.data.Dataset:
+        """
+        Wrap this generator in a tf.data.Dataset that builds batches on tf.data worker threads
+        and prefetches them so the accelerator is not starved by the Python pipeline.
+
+        The dataset cycles indefinitely, shuffling the batch seeds between passes just like
+        on_epoch_end; pair it with steps_per_epoch/validation_steps when fitting.
+        """
+        if num_parallel_calls is None:
+            num_parallel_calls = tf.data.AUTOTUNE
+        sample_batch = self[0]
+        flat_sample = tf.nest.flatten(sample_batch)
+        dtypes = [tf.as_dtype(np.asarray(value).dtype) for value in flat_sample]
+        shapes = [(None,)*np.asarray(value).ndim for value in flat_sample]
+        def generate_batch(batch_index):
+            return tf.nest.flatten(self[batch_index])
+        def map_batch(batch_index):
+            flat_batch = tf.numpy_function(generate_batch, [batch_index], dtypes)
+            for value, shape in zip(flat_batch, shapes):
+                value.set_shape(shape)
+            return tf.nest.pack_sequence_as(sample_batch, flat_batch)
+        def batch_indices():
+            yield from range(self.batches_per_epoch)
+            self.on_epoch_end()
+        return tf.data.Dataset.from_generator(
+                batch_indices,
+                output_signature=tf.TensorSpec((), tf.int64)) \
+            .repeat() \
+            .map(map_batch, num_parallel_calls=num_parallel_calls) \
+            .prefetch(tf.data.AUTOTUNE)
+
 
 def random_fasta_samples(
     samples: Iterable[sample.FastaSample|sample.DemultiplexedFastaSample],
@@ -91,8 +122,17 @@ def random_fasta_samples(
         p /= p.sum()
     else:
         p = weights
-    def factory(batch_size: int, np_rng: np.random.Generator):
-        return dict(samples=np_rng.choice(samples, size=batch_size, replace=True, p=p))
+    if p is None:
+        def factory(batch_size: int, np_rng: np.random.Generator):
+            sample_indices = np_rng.integers(len(samples), size=batch_size)
+            return dict(samples=samples[sample_indices], sample_indices=sample_indices)
+    else:
+        # Inverse-CDF sampling; cheaper per batch than np_rng.choice with weights
+        cdf = np.cumsum(p)
+        cdf /= cdf[-1]
+        def factory(batch_size: int, np_rng: np.random.Generator):
+            sample_indices = np.searchsorted(cdf, np_rng.random(batch_size), side="right")
+            return dict(samples=samples[sample_indices], sample_indices=sample_indices)
     return factory
 
 
@@ -164,7 +204,16 @@ def encode_sequences(kmer: int = 1, ambiguous_bases: bool = False):
 def encode_kmers(kmer: int, augment_ambiguous_bases: bool = False):
     if kmer == 1:
         return lambda encoded_sequences: dict(encoded_kmer_sequences=np.array(encoded_sequences))
-    return lambda encoded_sequences: dict(encoded_kmer_sequences=dna.encode_kmers(np.array(encoded_sequences), kmer, augment_ambiguous_bases))
+    if augment_ambiguous_bases:
+        return lambda encoded_sequences: dict(encoded_kmer_sequences=dna.encode_kmers(np.array(encoded_sequences), kmer, augment_ambiguous_bases))
+    # Vectorized rolling window: view the base codes through a sliding window and collapse
+    # each window to a single k-mer identifier with one dot product against powers of 4.
+    powers = 4**np.arange(kmer - 1, -1, -1)
+    def factory(encoded_sequences):
+        windows = np.lib.stride_tricks.sliding_window_view(
+            np.asarray(encoded_sequences), kmer, axis=-1)
+        return dict(encoded_kmer_sequences=windows @ powers)
+    return factory
 
 
 def taxonomy_indices(taxonomy_db: taxonomy.TaxonomyDb):
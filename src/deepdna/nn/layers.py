@@ -398,6 +398,107 @@ class RelativeMultiHeadAttention(tf.keras.layers.MultiHeadAttention):
         })
         return config
 
+@CustomObject
+class FusedMultiHeadSelfAttention(TypedLayer[..., tf.Tensor]):
+    """
+    Multi-head self-attention with a single fused Q/K/V projection.
+
+    Rather than projecting Q, K, and V with three separate kernels, a single kernel of width
+    3*embed_dim is used, replacing three small GEMMs with one larger GEMM that better saturates
+    the hardware and amortizes weight-load bandwidth.
+
+    When key_block_size is given, the attention itself is computed over key/value tiles with a
+    running online softmax so the full (N, N) attention matrix is never materialized in memory.
+    """
+    def __init__(
+        self,
+        embed_dim: int,
+        num_heads: int,
+        key_block_size: Optional[int] = None,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        assert embed_dim % num_heads == 0, "embed_dim must be divisible by num_heads."
+        self.embed_dim = embed_dim
+        self.num_heads = num_heads
+        self.key_dim = embed_dim // num_heads
+        self.key_block_size = key_block_size
+        self.qkv_dense = tf.keras.layers.Dense(3*embed_dim, name="qkv")
+        self.output_dense = tf.keras.layers.Dense(embed_dim, name="attention_output")
+
+    def _tiled_attention(self, q: tf.Tensor, k: tf.Tensor, v: tf.Tensor) -> tf.Tensor:
+        """
+        Compute softmax(QK^T)V one key/value tile at a time, carrying the running max/sum of
+        the online softmax between tiles (FlashAttention-style).
+        """
+        block_size = self.key_block_size
+        set_len = tf.shape(k)[2]
+        m = tf.zeros_like(q[:,:,:,:1]) + q.dtype.min # running max
+        l = tf.zeros_like(q[:,:,:,:1])               # running sum
+        acc = tf.zeros_like(q)
+        def step(i, m, l, acc):
+            key_block = k[:,:,i:i+block_size,:]
+            value_block = v[:,:,i:i+block_size,:]
+            scores = tf.matmul(q, key_block, transpose_b=True)
+            m_new = tf.maximum(m, tf.reduce_max(scores, axis=-1, keepdims=True))
+            correction = tf.exp(m - m_new)
+            p = tf.exp(scores - m_new)
+            l_new = l*correction + tf.reduce_sum(p, axis=-1, keepdims=True)
+            acc_new = acc*correction + tf.matmul(p, value_block)
+            return i + block_size, m_new, l_new, acc_new
+        i, m, l, acc = step(0, m, l, acc)
+        _, _, l, acc = tf.while_loop(
+            cond=lambda i, *_: i < set_len,
+            body=step,
+            loop_vars=[i, m, l, acc])
+        return acc / l
+
+    def call(
+        self,
+        query: tf.Tensor,
+        value: Optional[tf.Tensor] = None, # unused; Q, K, and V are all projected from `query`
+        training: Optional[bool] = None,
+        return_attention_scores: bool = False
+    ):
+        batch_size = tf.shape(query)[0]
+        set_len = tf.shape(query)[1]
+
+        # Project Q, K, and V together: (B, N, 3*embed_dim) -> (3, B, H, N, key_dim)
+        qkv = self.qkv_dense(query)
+        qkv = tf.reshape(qkv, (batch_size, set_len, 3, self.num_heads, self.key_dim))
+        qkv = tf.transpose(qkv, perm=(2, 0, 3, 1, 4))
+        q, k, v = qkv[0], qkv[1], qkv[2]
+
+        # Note: Applying scalar multiply at the smaller end of the matmul improves
+        # XLA performance, but may introduce slight numeric differences in
+        # the Transformer attention head.
+        q = tf.multiply(q, 1.0 / np.sqrt(float(self.key_dim)))
+
+        if self.key_block_size is not None and not return_attention_scores:
+            attention_output = self._tiled_attention(q, k, v) # (B, H, N, key_dim)
+        else:
+            # Single matmul batched across all heads
+            attention_scores = tf.nn.softmax(tf.matmul(q, k, transpose_b=True))
+            attention_output = tf.matmul(attention_scores, v) # (B, H, N, key_dim)
+
+        # Merge the heads back together for the output projection
+        attention_output = tf.transpose(attention_output, perm=(0, 2, 1, 3))
+        attention_output = tf.reshape(attention_output, (batch_size, set_len, self.embed_dim))
+        output = self.output_dense(attention_output)
+        if return_attention_scores:
+            return output, attention_scores
+        return output
+
+    def compute_output_shape(self, input_shape):
+        return input_shape
+
+    def get_config(self):
+        return super().get_config() | {
+            "embed_dim": self.embed_dim,
+            "num_heads": self.num_heads,
+            "key_block_size": self.key_block_size
+        }
+
 # Transformers -------------------------------------------------------------------------------------
 
 class BaseTransformerBlock(TypedLayer[[tf.Tensor], tf.Tensor]):
@@ -478,24 +579,34 @@ class BaseTransformerBlock(TypedLayer[[tf.Tensor], tf.Tensor]):
 
 @CustomObject
 class TransformerBlock(BaseTransformerBlock):
-    def __init__(self, *args, use_vaswani_mha: bool = False, **kwargs):
+    def __init__(
+        self,
+        *args,
+        use_vaswani_mha: bool = False,
+        use_fused_mha: bool = False,
+        **kwargs
+    ):
         self.use_vaswani_mha = use_vaswani_mha
+        self.use_fused_mha = use_fused_mha
         super().__init__(*args, **kwargs)
 
     def create_attention_layer(self, embed_dim: int, num_heads: int):
         if self.use_vaswani_mha:
             return VaswaniMultiHeadAttention(num_heads=num_heads, embed_dim=embed_dim)
+        if self.use_fused_mha:
+            return FusedMultiHeadSelfAttention(embed_dim=embed_dim, num_heads=num_heads)
         return tf.keras.layers.MultiHeadAttention(num_heads=num_heads, key_dim=embed_dim)
 
     def build(self, input_shape: tuple[int, ...]):
-        if not self.use_vaswani_mha:
+        if not self.use_vaswani_mha and not self.use_fused_mha:
             self.att._build_from_signature(input_shape, input_shape)
         return super().build(input_shape)
 
     def get_config(self):
         config = super().get_config()
         config.update({
-            "use_vaswani_mha": self.use_vaswani_mha
+            "use_vaswani_mha": self.use_vaswani_mha,
+            "use_fused_mha": self.use_fused_mha
         })
         return config
 
@@ -720,6 +831,70 @@ class ChunkedEmbeddingLayer(TypedLayer[[tf.Tensor], tf.Tensor]):
             "swap_memory": self.swap_memory
         }
 
+# Spectral Normalization ---------------------------------------------------------------------------
+
+@CustomObject
+class SpectralDense(TypedLayer[[tf.Tensor], tf.Tensor]):
+    """
+    A Dense layer with spectral weight normalization.
+
+    The dominant singular vector and the resulting singular value are cached in non-trainable
+    variables and refined with a single power-iteration step per training call. At inference the
+    cached estimate is reused directly, so no power-iteration kernels are issued and the layer
+    reduces to one normalized matmul.
+    """
+    def __init__(self, units: int, activation: Any = None, use_bias: bool = True, **kwargs):
+        super().__init__(**kwargs)
+        self.units = units
+        self.activation = tf.keras.activations.get(activation)
+        self.use_bias = use_bias
+
+    def build(self, input_shape: tuple[int, ...]):
+        self.kernel = self.add_weight(
+            "kernel",
+            shape=(input_shape[-1], self.units),
+            initializer="glorot_uniform",
+            trainable=True)
+        if self.use_bias:
+            self.bias = self.add_weight(
+                "bias",
+                shape=(self.units,),
+                initializer="zeros",
+                trainable=True)
+        self.u = self.add_weight(
+            "u",
+            shape=(1, input_shape[-1]),
+            initializer="random_normal",
+            trainable=False)
+        self.sigma = self.add_weight(
+            "sigma",
+            shape=(),
+            initializer="ones",
+            trainable=False)
+        return super().build(input_shape)
+
+    def call(self, inputs: tf.Tensor, training: Optional[bool] = None) -> tf.Tensor:
+        if training:
+            # One power-iteration step per training call; u and sigma are cached for inference.
+            v = tf.math.l2_normalize(tf.matmul(self.u, self.kernel))
+            u = tf.math.l2_normalize(tf.matmul(v, self.kernel, transpose_b=True))
+            self.u.assign(u)
+            self.sigma.assign(tf.squeeze(tf.matmul(tf.matmul(u, self.kernel), v, transpose_b=True)))
+        y = tf.matmul(inputs, self.kernel / self.sigma)
+        if self.use_bias:
+            y = tf.nn.bias_add(y, self.bias)
+        return self.activation(y)
+
+    def compute_output_shape(self, input_shape):
+        return (*input_shape[:-1], self.units)
+
+    def get_config(self):
+        return super().get_config() | {
+            "units": self.units,
+            "activation": tf.keras.activations.serialize(self.activation),
+            "use_bias": self.use_bias
+        }
+
 # Set Generation -----------------------------------------------------------------------------------
 
 @CustomObject
@@ -152,7 +152,9 @@ class CustomModel(tf.keras.Model):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._accumulation_steps: int = 1
+        self._accumulation_counter: int = 0
         self._gradient_accumulator: GradientAccumulator
+        self._gradient_accumulator_cache: dict[tuple[int, ...], GradientAccumulator] = {}
 
     def default_loss(self):
         """
@@ -204,12 +206,11 @@ class CustomModel(tf.keras.Model):
     def get_config(self):
         return {}
 
-    def train_step(self, batch):
+    def _accumulated_train_step(self, batch, apply_gradients: bool):
         """
-        The standard training regime supporting accumulating gradients for large batch training.
+        Compute and accumulate gradients for a single batch, optionally applying the
+        accumulated gradients. `apply_gradients` is a Python bool baked into each trace.
         """
-        if self._accumulation_steps == 1:
-            return super().train_step(batch)
         # Compute gradients and update metrics
         x, y = batch
         with tf.GradientTape() as tape:
@@ -218,29 +219,56 @@ class CustomModel(tf.keras.Model):
             loss = self.compiled_loss(y, y_pred, regularization_losses=self.losses)
         grads = tape.gradient(loss, self.trainable_weights)
         self.compiled_metrics.update_state(y, y_pred)
-        # Accumulate the gradients
+        # Accumulate (and possibly apply) the gradients
         self._gradient_accumulator.accumulate(grads)
-        # Apply the gradients
-        tf.cond(
-            self._gradient_accumulator.iteration == self._accumulation_steps,
-            lambda: self._gradient_accumulator.apply_gradients(self.optimizer),
-            lambda: None)
+        if apply_gradients:
+            self._gradient_accumulator.apply_gradients(self.optimizer)
         return {m.name: m.result() for m in self.metrics}
 
+    def make_train_function(self, force=False):
+        """
+        When accumulating gradients, dispatch each step to one of two compiled functions
+        (accumulate-only or accumulate-and-apply) from a host-side counter rather than
+        branching on a tf.cond inside the graph.
+        """
+        if self._accumulation_steps == 1:
+            return super().make_train_function(force=force)
+        if self.train_function is not None and not force:
+            return self.train_function
+        @tf.function
+        def accumulate_only(iterator):
+            return self._accumulated_train_step(next(iterator), apply_gradients=False)
+        @tf.function
+        def accumulate_and_apply(iterator):
+            return self._accumulated_train_step(next(iterator), apply_gradients=True)
+        def train_function(iterator):
+            self._accumulation_counter += 1
+            if self._accumulation_counter >= self._accumulation_steps:
+                self._accumulation_counter = 0
+                return accumulate_and_apply(iterator)
+            return accumulate_only(iterator)
+        self.train_function = train_function
+        return self.train_function
+
     def fit(self, *args, accumulation_steps: int = 1, callbacks=None, **kwargs):
         assert accumulation_steps > 0, "Accumulation steps cannot be less than 1."
         if accumulation_steps != self._accumulation_steps:
             self._accumulation_steps = accumulation_steps
             self.train_function = None
+        self._accumulation_counter = 0
         if accumulation_steps > 1:
-            self._gradient_accumulator = GradientAccumulator(self.trainable_weights)
+            # Reuse the accumulation buffers across fit calls; they can be as large as the
+            # model weights themselves.
+            key = tuple(id(w) for w in self.trainable_weights)
+            if key in self._gradient_accumulator_cache:
+                self._gradient_accumulator_cache[key].reset()
+            else:
+                self._gradient_accumulator_cache[key] = GradientAccumulator(self.trainable_weights)
+            self._gradient_accumulator = self._gradient_accumulator_cache[key]
         if callbacks is None:
             callbacks = []
         callbacks.append(CustomModel.CustomModelEventCallback())
-        history = super().fit(*args, callbacks=callbacks, **kwargs)
-        if getattr(self, "_gradient_accumulator", None) is not None:
-            del self._gradient_accumulator
-        return history
+        return super().fit(*args, callbacks=callbacks, **kwargs)
 
     def __call__(self, *args, **kwargs) -> tf.Tensor:
         return super().__call__(*args, **kwargs) # type: ignore
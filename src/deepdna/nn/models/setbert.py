@@ -421,7 +421,10 @@ class SetBertSfdClassifierModel(AttentionScoreProvider, ModelWrapper, CustomMode
                 output_class=True,
                 output_sequences=False
             ),
-            output_dense=tf.keras.layers.Dense(1, activation="sigmoid", name="fungus_present"))
+            # The output head stays fp32 under mixed-precision policies to keep the
+            # sigmoid/loss numerics stable.
+            output_dense=tf.keras.layers.Dense(
+                1, activation="sigmoid", dtype="float32", name="fungus_present"))
         self.freeze_sequence_embeddings = freeze_sequence_embeddings
 
     def build_model(self):
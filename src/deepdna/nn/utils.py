@@ -92,6 +92,9 @@ class GradientAccumulator:
 
     def apply_gradients(self, optimizer):
         optimizer.apply_gradients(zip(self._accumulated_gradients, self.trainable_weights))
+        self.reset()
+
+    def reset(self):
         for grad in self._accumulated_gradients:
             grad.assign(tf.zeros_like(grad))
         self.iteration.assign(0)